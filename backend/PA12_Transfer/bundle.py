@@ -0,0 +1,481 @@
+# --------------------------------------------------------------------------------------
+# Offline model bundles: snapshot objects from a Planning Analytics source into a
+# compressed file and replay them into any target through the transfer functions
+#
+# A bundle is gzip compressed JSON, one frame per line:
+#   1. header - format, version, creation time, TM1py/mdxpy versions and the list
+#               of exported objects
+#   2. per object, in its own gzip member
+#      - object frame
+#      - call frames  - source responses in the order the transfer asked for them
+#      - cells frame  - cellset size, followed by chunks of CHUNK_SIZE cells
+#      - end frame
+#
+# Export runs the normal transfer function against a recording proxy of the source
+# and a target that discards writes, so the source is read exactly once. Import runs
+# the same transfer function against a proxy that answers from the bundle in the
+# recorded order. Cellsets are written to file and to target chunk by chunk.
+# --------------------------------------------------------------------------------------
+
+import os
+import gzip
+import json
+import shutil
+import tempfile
+import itertools
+import datetime
+import zlib
+from importlib import metadata
+from TM1py.Objects import TM1Object  # type: ignore
+from TM1py.Objects import Cube, Dimension, MDXView, NativeView, Process, Subset  # type: ignore
+from PA12_Transfer import transfer
+import logging_config
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 'pa12-bundle'
+BUNDLE_VERSION = 1
+BUNDLE_EXTENSION = '.pa12b'
+CHUNK_SIZE = 50000
+
+
+class BundleError(Exception):
+    """ Bundle file is invalid or does not match the transfer replaying it. """
+
+
+class BundleExistsError(BundleError):
+    """ Bundle with the same name already exists. """
+
+
+def _package_version(package: str):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+# ─── TM1py object encoding ───
+
+def _encode_hierarchy(hierarchy) -> dict:
+    hierarchy_as_dict = dict(hierarchy.body_as_dict)
+    hierarchy_as_dict['ElementAttributes'] = [attribute.body_as_dict for attribute
+                                              in hierarchy.element_attributes]
+    if hierarchy.default_member:
+        hierarchy_as_dict['DefaultMember'] = {'Name': hierarchy.default_member}
+    return hierarchy_as_dict
+
+
+def _encode_dimension(dimension: Dimension) -> dict:
+    return {'Name': dimension.name,
+            'Hierarchies': [_encode_hierarchy(hier) for hier in dimension.hierarchies]}
+
+
+def _encode_cube(cube: Cube) -> dict:
+    return {'Name': cube.name,
+            'Dimensions': [{'Name': dim} for dim in cube.dimensions],
+            'Rules': str(cube.rules) if cube.has_rules else None}
+
+
+def _encode_subset(subset: Subset) -> dict:
+    return {'Name': subset.name,
+            'UniqueName': f'[{subset.dimension_name}].[{subset.hierarchy_name}].[{subset.name}]',
+            'Hierarchy': {'Name': subset.hierarchy_name},
+            'Alias': subset.alias,
+            'Expression': subset.expression,
+            'Elements': [{'Name': elem} for elem in subset.elements]}
+
+
+# Classes that can be stored in a bundle: name -> (class, encode, decode)
+_OBJECT_CODECS = {
+    'Dimension': (Dimension, _encode_dimension,
+                  lambda data, cube: Dimension.from_dict(data)),
+    'Cube': (Cube, _encode_cube,
+             lambda data, cube: Cube.from_dict(data)),
+    'Process': (Process, lambda process: json.loads(process.body),
+                lambda data, cube: Process.from_dict(data)),
+    'Subset': (Subset, _encode_subset,
+               lambda data, cube: Subset.from_dict(data)),
+    'NativeView': (NativeView, lambda view: json.loads(view.body),
+                   lambda data, cube: NativeView.from_dict(data, cube)),
+    'MDXView': (MDXView, lambda view: json.loads(view.body),
+                lambda data, cube: MDXView.from_dict(data, cube)),
+}
+
+
+def _is_plain(value) -> bool:
+    """ Check that value is stored as JSON without loss. """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    return False
+
+
+def _encode_value(value) -> dict:
+    for class_name, (cls, encode, _) in _OBJECT_CODECS.items():
+        if type(value) is cls:
+            return {'object': {'class': class_name,
+                               'cube': getattr(value, 'cube', None),
+                               'data': encode(value)}}
+    if _is_plain(value):
+        return {'value': value}
+    raise BundleError(f'Cannot store {type(value).__name__} in bundle')
+
+
+def _decode_value(frame: dict):
+    if 'object' not in frame:
+        return frame['value']
+    obj = frame['object']
+    if obj.get('class') not in _OBJECT_CODECS:
+        raise BundleError(f'Unknown object class in bundle: {obj.get("class")}')
+    _, _, decode = _OBJECT_CODECS[obj['class']]
+    return decode(obj['data'], obj.get('cube'))
+
+
+def _call_args(kwargs: dict) -> dict:
+    """ Arguments stored for a call, MDX text is left out as it depends on mdxpy. """
+    args = {key: value for key, value in kwargs.items() if key != 'mdx'}
+    if not _is_plain(list(args.values())):
+        raise BundleError('Cannot store call arguments in bundle')
+    return args
+
+
+def _write_frame(file, frame: dict):
+    file.write(json.dumps(frame).encode('utf-8') + b'\n')
+
+
+# ─── Export ───
+
+class _RecordingService:
+    """ Proxy of a TM1py service that passes calls to source and records results. """
+
+    def __init__(self, service, name: str, source: '_RecordingSource'):
+        self._service = service
+        self._name = name
+        self._source = source
+
+    def __getattr__(self, method):
+        func = getattr(self._service, method)
+
+        def call(**kwargs):
+            try:
+                result = func(**kwargs)
+                self._source.record(self._name, method, kwargs, result)
+            except Exception as e:
+                # Transfer functions swallow some errors, remember the first one
+                if self._source.error is None:
+                    self._source.error = e
+                raise
+            return result
+        return call
+
+
+class _RecordingSource:
+    """ Proxy of a TM1Service used as tm1_source during export.
+    Every response is written to the bundle as soon as source returns it.
+    """
+
+    def __init__(self, tm1: TM1Object.TM1Object, file):
+        self._tm1 = tm1
+        self._file = file
+        self.error = None
+
+    def __getattr__(self, name):
+        return _RecordingService(getattr(self._tm1, name), name, self)
+
+    def record(self, service: str, method: str, kwargs: dict, result):
+        args = _call_args(kwargs)
+        if (service, method) == ('cells', 'execute_mdx'):
+            count = len(result) if result else 0
+            _write_frame(self._file, {'frame': 'cells', 'args': args, 'count': count,
+                                      'chunks': (count + CHUNK_SIZE - 1) // CHUNK_SIZE})
+            cells = iter(result.items()) if count else iter(())
+            while True:
+                chunk = [[list(key), value] for key, value
+                         in itertools.islice(cells, CHUNK_SIZE)]
+                if not chunk:
+                    break
+                _write_frame(self._file, {'frame': 'chunk', 'cells': chunk})
+        else:
+            frame = {'frame': 'call', 'service': service, 'method': method, 'args': args}
+            frame.update(_encode_value(result))
+            _write_frame(self._file, frame)
+
+
+class _NullService:
+    """ Service that accepts and discards all calls. """
+
+    def __getattr__(self, method):
+        def call(**kwargs):
+            return None
+        return call
+
+
+class _NullTarget:
+    """ Stand-in for tm1_target during export, nothing is written. """
+
+    def __getattr__(self, name):
+        return _NullService()
+
+
+def _transfer_object(tm1_source, tm1_target, object_name: str, object_type: str,
+                     include_data: bool):
+    """ Transfer one object the same way as the migrate endpoint. """
+    if object_type == 'dimension':
+        transfer.transfer_dimension(tm1_source=tm1_source, tm1_target=tm1_target,
+                                    dimension_name=object_name, include_subsets=True)
+    elif object_type == 'process':
+        transfer.transfer_process(tm1_source=tm1_source, tm1_target=tm1_target,
+                                  process_name=object_name)
+    elif object_type == 'cube':
+        transfer.transfer_cube(tm1_source=tm1_source, tm1_target=tm1_target,
+                               cube_name=object_name, include_data=include_data,
+                               include_views=True)
+    else:
+        raise BundleError(f'Unknown object type: {object_type}')
+
+
+def _export_object(tm1_source: TM1Object.TM1Object, file, object_name: str,
+                   object_type: str, include_data: bool):
+    """ Record one object transfer into file, raises if any source call failed. """
+    _write_frame(file, {'frame': 'object', 'name': object_name, 'type': object_type})
+    source = _RecordingSource(tm1_source, file)
+    _transfer_object(tm1_source=source, tm1_target=_NullTarget(), object_name=object_name,
+                     object_type=object_type, include_data=include_data)
+    if source.error is not None:
+        raise source.error
+    _write_frame(file, {'frame': 'end'})
+
+
+def export_bundle(tm1_source: TM1Object.TM1Object, objects: list, path: str,
+                  include_data: bool) -> dict:
+    """ Read selected objects from source once and write them into a new bundle file.
+    objects is list of dicts with name and type, include_data adds cube data.
+    Existing bundles are never replaced.
+    Returns dict with exported object count and names of failed objects.
+    """
+    logger.info(f'Export bundle: {path}')
+    if os.path.exists(path):
+        raise BundleExistsError(f'Bundle already exists: {os.path.basename(path)}')
+
+    bundle_dir = os.path.dirname(path)
+    body_fd, body_path = tempfile.mkstemp(dir=bundle_dir, suffix='.tmp')
+    os.close(body_fd)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=bundle_dir, suffix='.tmp')
+    os.close(tmp_fd)
+
+    exported = []
+    failed = []
+    try:
+        with open(body_path, 'w+b') as body_file:
+            # One gzip member per object, failed objects are cut off the file
+            for obj in objects:
+                object_name = obj['name']
+                object_type = obj['type']
+                logger.info(f'Export {object_type}: {object_name}')
+                offset = body_file.tell()
+                try:
+                    with gzip.GzipFile(filename='', mode='wb', fileobj=body_file) as member:
+                        _export_object(tm1_source=tm1_source, file=member,
+                                       object_name=object_name, object_type=object_type,
+                                       include_data=include_data)
+                except Exception as e:
+                    logger.error(f'{object_name} not exported: {e}')
+                    failed.append(object_name)
+                    body_file.seek(offset)
+                    body_file.truncate()
+                    continue
+                exported.append({'name': object_name, 'type': object_type})
+
+            # Header goes first, it is known only after all objects are exported
+            header = {'format': BUNDLE_FORMAT,
+                      'version': BUNDLE_VERSION,
+                      'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                      'tm1py': _package_version('TM1py'),
+                      'mdxpy': _package_version('mdxpy'),
+                      'include_data': include_data,
+                      'objects': exported}
+            with open(tmp_path, 'wb') as bundle_file:
+                with gzip.GzipFile(filename='', mode='wb', fileobj=bundle_file) as member:
+                    _write_frame(member, header)
+                body_file.seek(0)
+                shutil.copyfileobj(body_file, bundle_file)
+
+        # Link fails if a bundle with the same name was published meanwhile
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            raise BundleExistsError(f'Bundle already exists: {os.path.basename(path)}')
+    finally:
+        os.remove(body_path)
+        os.remove(tmp_path)
+
+    return {'exported': len(exported), 'failed': failed}
+
+
+# ─── Import ───
+
+class _FrameReader:
+    """ Reads bundle frames one line at a time. """
+
+    def __init__(self, file):
+        self._file = file
+        self.last = {}
+
+    def read(self) -> dict:
+        try:
+            line = self._file.readline()
+        except (OSError, EOFError, UnicodeDecodeError, zlib.error):
+            raise BundleError('Bundle file is corrupted or truncated')
+        if not line:
+            raise BundleError('Bundle file is truncated')
+        try:
+            frame = json.loads(line)
+        except ValueError:
+            raise BundleError('Bundle file is corrupted')
+        if not isinstance(frame, dict):
+            raise BundleError('Bundle file is corrupted')
+        self.last = frame
+        return frame
+
+    def skip_object(self):
+        """ Skip remaining frames of the current object. """
+        while self.last.get('frame') != 'end':
+            self.read()
+
+
+class _Cellset:
+    """ Cellset replayed from a bundle, chunks are read only while writing them. """
+
+    def __init__(self, reader: _FrameReader, count: int, chunk_count: int):
+        self._reader = reader
+        self._count = count
+        self._chunk_count = chunk_count
+        self._started = False
+        self.consumed = chunk_count == 0
+
+    def __len__(self):
+        return self._count
+
+    def chunks(self):
+        if self._started:
+            raise BundleError('Cellset in bundle can be read only once')
+        self._started = True
+        for _ in range(self._chunk_count):
+            frame = self._reader.read()
+            if frame.get('frame') != 'chunk':
+                raise BundleError('Cellset in bundle is incomplete')
+            yield {tuple(key): value for key, value in frame['cells']}
+        self.consumed = True
+
+
+class _ReplayService:
+    """ Service answering calls from the responses recorded in a bundle. """
+
+    def __init__(self, name: str, source: '_ReplaySource'):
+        self._name = name
+        self._source = source
+
+    def __getattr__(self, method):
+        def call(**kwargs):
+            return self._source.replay(self._name, method, kwargs)
+        return call
+
+
+class _ReplaySource:
+    """ Stand-in for tm1_source during import, backed by one object of a bundle.
+    Calls must come in the recorded order, any mismatch fails the object.
+    """
+
+    def __init__(self, reader: _FrameReader):
+        self._reader = reader
+        self._cellset = None
+        self.error = None
+
+    def __getattr__(self, name):
+        return _ReplayService(name, self)
+
+    def _check_cellset_consumed(self):
+        if self._cellset is not None and not self._cellset.consumed:
+            raise BundleError('Cellset in bundle was not written to target')
+
+    def replay(self, service: str, method: str, kwargs: dict):
+        try:
+            self._check_cellset_consumed()
+            frame = self._reader.read()
+            if (service, method) == ('cells', 'execute_mdx'):
+                expected = {'frame': 'cells'}
+            else:
+                expected = {'frame': 'call', 'service': service, 'method': method}
+            if any(frame.get(key) != value for key, value in expected.items()) \
+                    or frame.get('args') != _call_args(kwargs):
+                raise BundleError(f'Call {service}.{method} does not match bundle')
+            if frame['frame'] == 'cells':
+                self._cellset = _Cellset(self._reader, frame['count'], frame['chunks'])
+                return self._cellset
+            return _decode_value(frame)
+        except Exception as e:
+            # Transfer functions swallow some errors, remember the first one
+            if self.error is None:
+                self.error = e
+            raise
+
+    def finish(self):
+        """ Check that transfer used every recorded response of the object. """
+        if self.error is not None:
+            raise self.error
+        self._check_cellset_consumed()
+        if self._reader.read().get('frame') != 'end':
+            raise BundleError('Bundle has responses the transfer did not use')
+
+
+def _check_header(header: dict) -> dict:
+    if header.get('format') != BUNDLE_FORMAT:
+        raise BundleError('Not a bundle file')
+    if header.get('version') != BUNDLE_VERSION:
+        raise BundleError(f'Unsupported bundle version: {header.get("version")}')
+    return header
+
+
+def read_bundle_header(path: str) -> dict:
+    """ Return header of bundle file without reading the objects. """
+    with gzip.open(path, 'rt', encoding='utf-8') as bundle_file:
+        return _check_header(_FrameReader(bundle_file).read())
+
+
+def import_bundle(tm1_target: TM1Object.TM1Object, path: str) -> dict:
+    """ Replay all objects of a bundle file into target.
+    Returns dict with imported object count and names of failed objects.
+    """
+    logger.info(f'Import bundle: {path}')
+    imported = 0
+    failed = []
+    with gzip.open(path, 'rt', encoding='utf-8') as bundle_file:
+        reader = _FrameReader(bundle_file)
+        header = _check_header(reader.read())
+        for package in ['TM1py', 'mdxpy']:
+            if header.get(package.lower()) != _package_version(package):
+                logger.warning(f'Bundle exported with {package} {header.get(package.lower())}, '
+                               f'importing with {_package_version(package)}')
+
+        for _ in header['objects']:
+            frame = reader.read()
+            if frame.get('frame') != 'object' or 'name' not in frame or 'type' not in frame:
+                raise BundleError('Bundle file is corrupted')
+            object_name = frame['name']
+            logger.info(f'Import {frame["type"]}: {object_name}')
+            source = _ReplaySource(reader)
+            try:
+                _transfer_object(tm1_source=source, tm1_target=tm1_target,
+                                 object_name=object_name, object_type=frame['type'],
+                                 include_data=header['include_data'])
+                source.finish()
+                imported += 1
+            except Exception as e:
+                logger.error(f'{object_name} not imported: {e}')
+                failed.append(object_name)
+                reader.skip_object()
+
+    return {'imported': imported, 'failed': failed}
@@ -20,6 +20,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _cell_chunks(data):
+    """ Return cellset as list of chunks to write. Cellsets replayed from a bundle
+    are read chunk by chunk, cellsets from a live source are written at once.
+    """
+    if hasattr(data, 'chunks'):
+        return data.chunks()
+    return [data]
+
+
 def transfer_process(tm1_source: TM1Object.TM1Object, tm1_target: TM1Object.TM1Object,
                      process_name: str):
     """ Retrieve specific process from source and update or create it into target. """
@@ -191,16 +200,17 @@ def transfer_hierarchy_attribute_data(tm1_source: TM1Object.TM1Object,
 
         # Write values to target
         if len(data) != 0:
-            data_hier = {}
-            # Add hierarchy prefix to tuple value
-            for key, value in data.items():
-                key_list = list(key)
-                key_list[0] = hier_name + ':' + key[0]
-                key = tuple(key_list)
-                data_hier[key] = value
-            tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data_hier,
-                                   dimensions=dimensions, use_blob=True,
-                                   skip_non_updateable=True)
+            for chunk in _cell_chunks(data):
+                data_hier = {}
+                # Add hierarchy prefix to tuple value
+                for key, value in chunk.items():
+                    key_list = list(key)
+                    key_list[0] = hier_name + ':' + key[0]
+                    key = tuple(key_list)
+                    data_hier[key] = value
+                tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data_hier,
+                                       dimensions=dimensions, use_blob=True,
+                                       skip_non_updateable=True)
 
 
 def transfer_cube_leaves_data(tm1_source: TM1Object.TM1Object,
@@ -270,9 +280,10 @@ def transfer_cube_leaves_data(tm1_source: TM1Object.TM1Object,
 
             # Write values to target
             if len(data) != 0:
-                tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data,
-                                       dimensions=dimensions, use_blob=True,
-                                       skip_non_updateable=True)
+                for chunk in _cell_chunks(data):
+                    tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=chunk,
+                                           dimensions=dimensions, use_blob=True,
+                                           skip_non_updateable=True)
     # Case where all leaves transferred at once
     else:
         # Get cube data
@@ -305,9 +316,10 @@ def transfer_cube_leaves_data(tm1_source: TM1Object.TM1Object,
 
         # Write values to target
         if len(data) != 0:
-            tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data,
-                                   dimensions=dimensions, use_blob=True,
-                                   skip_non_updateable=True)
+            for chunk in _cell_chunks(data):
+                tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=chunk,
+                                       dimensions=dimensions, use_blob=True,
+                                       skip_non_updateable=True)
 
 
 def transfer_cube_consolidation_data(tm1_source: TM1Object.TM1Object,
@@ -377,25 +389,26 @@ def transfer_cube_consolidation_data(tm1_source: TM1Object.TM1Object,
 
         # Write values to target
         if len(data) != 0:
-            data_final = {}
             # Check if any hierarchies in use
             check = False
             for dimension, hierarchy in zip(dim_hierarchies.keys(), combination):
                 if dimension != hierarchy:
                     check = True
-            # Add hierarchy prefix to tuple values
-            if check:
-                for key, value in data.items():
-                    for idx, (dimension, hierarchy) in enumerate(zip(
-                            dim_hierarchies.keys(),
-                            combination)):
-                        key_list = list(key)
-                        if dimension != hierarchy:
-                            key_list[idx] = hierarchy + ':' + key[idx]
-                        key = tuple(key_list)
-                    data_final[key] = value
-            else:
-                data_final = data
-            tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data_final,
-                                dimensions=dimensions, use_blob=True,
-                                skip_non_updateable=True)
\ No newline at end of file
+            for chunk in _cell_chunks(data):
+                data_final = {}
+                # Add hierarchy prefix to tuple values
+                if check:
+                    for key, value in chunk.items():
+                        for idx, (dimension, hierarchy) in enumerate(zip(
+                                dim_hierarchies.keys(),
+                                combination)):
+                            key_list = list(key)
+                            if dimension != hierarchy:
+                                key_list[idx] = hierarchy + ':' + key[idx]
+                            key = tuple(key_list)
+                        data_final[key] = value
+                else:
+                    data_final = chunk
+                tm1_target.cells.write(cube_name=cube_name, cellset_as_dict=data_final,
+                                    dimensions=dimensions, use_blob=True,
+                                    skip_non_updateable=True)
\ No newline at end of file
@@ -4,8 +4,9 @@ import uuid
 from datetime import datetime
 from flask import Flask, request, jsonify ,send_from_directory
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 from TM1py import TM1Service
-from PA12_Transfer import transfer
+from PA12_Transfer import transfer, bundle
 
 app = Flask(__name__,
     static_folder="../frontend/build",
@@ -15,8 +16,10 @@ CORS(app)
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 ENV_FILE = os.path.join(DATA_DIR, 'environments.json')
 CRED_FILE = os.path.join(DATA_DIR, 'credentials.json')
+BUNDLE_DIR = os.path.join(DATA_DIR, 'bundles')
 
 os.makedirs(DATA_DIR, exist_ok=True)
+os.makedirs(BUNDLE_DIR, exist_ok=True)
 
 
 
@@ -43,6 +46,15 @@ def _save_credentials(data):
     with open(CRED_FILE, 'w') as f:
         json.dump(data, f, indent=2)
 
+
+def _bundle_path(name):
+    filename = secure_filename(name)
+    if not filename:
+        raise ValueError('Invalid bundle name')
+    if not filename.endswith(bundle.BUNDLE_EXTENSION):
+        filename = filename + bundle.BUNDLE_EXTENSION
+    return os.path.join(BUNDLE_DIR, filename)
+
 # ─── Server react build ───
 
 @app.route("/")
@@ -211,6 +223,74 @@ def migrate():
 
 
 
+# ─── Offline bundles: export from source once, import into any target ───
+
+@app.route('/api/bundles', methods=['GET'])
+def list_bundles():
+    bundles = []
+    for filename in sorted(os.listdir(BUNDLE_DIR)):
+        if not filename.endswith(bundle.BUNDLE_EXTENSION):
+            continue
+        try:
+            header = bundle.read_bundle_header(os.path.join(BUNDLE_DIR, filename))
+        except Exception:
+            continue
+        bundles.append({"name": filename,
+                        "createdAt": header['created'],
+                        "includeData": header['include_data'],
+                        "objects": header['objects']})
+    return jsonify(bundles)
+
+
+@app.route('/api/bundles/export', methods=['POST'])
+def export_bundle():
+    data = request.json
+    try:
+        name = data.get('name') or f"bundle_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        path = _bundle_path(name)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    # Bundles are snapshots, an existing bundle is never replaced
+    if os.path.exists(path):
+        return jsonify({"success": False, "message": f"Bundle {os.path.basename(path)} already exists"}), 409
+    try:
+        tm1_source = create_connection(data['source'])
+    except Exception as e:
+        return jsonify({"success": False, "error": "Invalid credentials"})
+    try:
+        result = bundle.export_bundle(tm1_source=tm1_source, objects=data['objects'],
+                                      path=path, include_data=data.get('includeData', False))
+        message = f"Exported {result['exported']} objects to {os.path.basename(path)}"
+        if result['failed']:
+            message = message + f", Error on {', '.join(result['failed'])}"
+        return jsonify({"success": True, "message": message, "name": os.path.basename(path)})
+    except bundle.BundleExistsError as e:
+        return jsonify({"success": False, "message": str(e)}), 409
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+@app.route('/api/bundles/import', methods=['POST'])
+def import_bundle():
+    data = request.json
+    try:
+        tm1_target = create_connection(data['target'])
+    except Exception as e:
+        return jsonify({"success": False, "error": "Invalid credentials"})
+    try:
+        path = _bundle_path(data['bundle'])
+        if not os.path.exists(path):
+            return jsonify({"success": False, "message": "Bundle not found"}), 404
+        result = bundle.import_bundle(tm1_target=tm1_target, path=path)
+        message = f"Migrated {result['imported']} objects successfully"
+        if result['failed']:
+            message = message + f", Error on {', '.join(result['failed'])}"
+        return jsonify({"success": True, "message": message})
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+
 #--- Registering to the app and saving the information to the credentials app
 
 @app.route("/api/auth/register", methods=["POST"])
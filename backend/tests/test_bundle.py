@@ -0,0 +1,313 @@
+import datetime
+import gzip
+import json
+import os
+import pickle
+
+import pytest
+from TM1py.Objects import (AnonymousSubset, Cube, Dimension, Hierarchy, MDXView,  # type: ignore
+                           NativeView, Process, Subset, ViewAxisSelection)
+from TM1py.Utils import CaseAndSpaceInsensitiveTuplesDict  # type: ignore
+
+from PA12_Transfer import bundle, transfer
+
+
+# ─── Fake Planning Analytics environments ───
+
+class FakeSource:
+    """ Source with one dimension, one cube and one process. Counts all calls. """
+
+    def __init__(self, cells_per_query=5):
+        self.calls = []
+        self.cells_per_query = cells_per_query
+
+    def __getattr__(self, service):
+        return FakeSourceService(self, service)
+
+    def respond(self, service, method, kwargs):
+        self.calls.append((service, method))
+        if (service, method) == ('dimensions', 'get'):
+            hier = Hierarchy('D1', 'D1')
+            hier.add_element('a', 'Numeric')
+            hier.add_element('t', 'Consolidated')
+            hier.add_edge('t', 'a', 1)
+            hier.add_element_attribute('Caption', 'Alias')
+            return Dimension('D1', [hier, Hierarchy('Alt', 'D1')])
+        if (service, method) == ('cubes', 'exists'):
+            return True
+        if (service, method) == ('cubes', 'get'):
+            return Cube('C1', ['D1', 'M'])
+        if (service, method) == ('cubes', 'get_dimension_names'):
+            if kwargs['cube_name'].startswith('}ElementAttributes_'):
+                return ['D1', kwargs['cube_name']]
+            return ['D1', 'M']
+        if (service, method) == ('hierarchies', 'get_all_names'):
+            return [kwargs['dimension_name'], 'Alt'] if kwargs['dimension_name'] == 'D1' else ['M']
+        if (service, method) == ('subsets', 'get_all_names'):
+            return ['S1']
+        if (service, method) == ('subsets', 'get'):
+            return Subset('S1', 'D1', kwargs['hierarchy_name'], elements=['a'])
+        if (service, method) == ('views', 'get_all_names'):
+            return (['Private'], ['V1', 'V2'])
+        if (service, method) == ('views', 'get'):
+            if kwargs['view_name'] == 'V1':
+                return MDXView('C1', 'V1', 'SELECT {[M].[M].Members} ON 0 FROM [C1]')
+            return NativeView('C1', 'V2', columns=[
+                ViewAxisSelection('M', AnonymousSubset('M', 'M', elements=['x']))])
+        if (service, method) == ('processes', 'get'):
+            return Process('P1', prolog_procedure="x = 1;")
+        if (service, method) == ('cells', 'execute_mdx'):
+            query = len(self.calls)
+            data = CaseAndSpaceInsensitiveTuplesDict()
+            for i in range(self.cells_per_query):
+                data[(f'e{i}', f'q{query}')] = i * 1.5
+            return data
+        raise AssertionError(f'Unexpected source call {service}.{method}')
+
+
+class FakeSourceService:
+
+    def __init__(self, source, service):
+        self._source = source
+        self._service = service
+
+    def __getattr__(self, method):
+        def call(**kwargs):
+            return self._source.respond(self._service, method, kwargs)
+        return call
+
+
+class FakeTarget:
+    """ Target that records everything written to it. """
+
+    def __init__(self):
+        self.writes = []
+
+    def __getattr__(self, service):
+        target = self
+
+        class Service:
+            def __getattr__(self, method):
+                def call(**kwargs):
+                    target.writes.append((service, method, kwargs))
+                return call
+        return Service()
+
+    def normalized(self):
+        """ Writes with objects as body and consecutive cell writes of a cube merged. """
+        events = []
+        for service, method, kwargs in self.writes:
+            if (service, method) == ('cells', 'write'):
+                cells = dict(kwargs['cellset_as_dict'].items())
+                if events and events[-1][:2] == ('cells', kwargs['cube_name']):
+                    events[-1][2].update(cells)
+                else:
+                    events.append(('cells', kwargs['cube_name'], cells))
+            else:
+                obj = next(iter(kwargs.values()))
+                events.append((service, method, obj.body))
+        return events
+
+    def cell_write_sizes(self):
+        return [len(kwargs['cellset_as_dict']) for service, method, kwargs in self.writes
+                if (service, method) == ('cells', 'write')]
+
+
+OBJECTS = [{'name': 'D1', 'type': 'dimension'},
+           {'name': 'C1', 'type': 'cube'},
+           {'name': 'P1', 'type': 'process'}]
+
+
+def migrate_live(source, target, include_data):
+    for obj in OBJECTS:
+        bundle._transfer_object(tm1_source=source, tm1_target=target, object_name=obj['name'],
+                                object_type=obj['type'], include_data=include_data)
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    return str(tmp_path / ('release' + bundle.BUNDLE_EXTENSION))
+
+
+def write_bundle(path, frames):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for frame in frames:
+            f.write(json.dumps(frame) + '\n')
+
+
+def header(objects, include_data=False):
+    return {'format': bundle.BUNDLE_FORMAT, 'version': bundle.BUNDLE_VERSION,
+            'created': '2026-01-01T00:00:00', 'tm1py': None, 'mdxpy': None,
+            'include_data': include_data, 'objects': objects}
+
+
+# ─── Round trip ───
+
+@pytest.mark.parametrize('include_data', [False, True])
+def test_import_reproduces_live_migration(bundle_path, include_data):
+    live = FakeTarget()
+    migrate_live(FakeSource(), live, include_data)
+
+    source = FakeSource()
+    result = bundle.export_bundle(tm1_source=source, objects=OBJECTS, path=bundle_path,
+                                  include_data=include_data)
+    assert result == {'exported': 3, 'failed': []}
+    source_calls = len(source.calls)
+
+    replayed = FakeTarget()
+    assert bundle.import_bundle(tm1_target=replayed, path=bundle_path) == \
+        {'imported': 3, 'failed': []}
+    assert replayed.normalized() == live.normalized()
+
+    # Bundle is reusable and never touches the source again
+    again = FakeTarget()
+    bundle.import_bundle(tm1_target=again, path=bundle_path)
+    assert again.normalized() == live.normalized()
+    assert len(source.calls) == source_calls
+
+
+def test_cellsets_are_written_in_chunks(bundle_path, monkeypatch):
+    monkeypatch.setattr(bundle, 'CHUNK_SIZE', 3)
+    live = FakeTarget()
+    migrate_live(FakeSource(cells_per_query=7), live, include_data=True)
+    bundle.export_bundle(tm1_source=FakeSource(cells_per_query=7), objects=OBJECTS,
+                         path=bundle_path, include_data=True)
+
+    replayed = FakeTarget()
+    bundle.import_bundle(tm1_target=replayed, path=bundle_path)
+    assert max(replayed.cell_write_sizes()) == 3
+    assert sum(replayed.cell_write_sizes()) == sum(live.cell_write_sizes())
+    assert replayed.normalized() == live.normalized()
+
+
+def test_header_lists_exported_objects_only(bundle_path):
+    objects = OBJECTS + [{'name': 'X', 'type': 'unknown'}]
+    result = bundle.export_bundle(tm1_source=FakeSource(), objects=objects, path=bundle_path,
+                                  include_data=False)
+    assert result == {'exported': 3, 'failed': ['X']}
+
+    header = bundle.read_bundle_header(bundle_path)
+    assert header['objects'] == OBJECTS
+    assert header['tm1py'] and header['mdxpy']
+    assert bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path) == \
+        {'imported': 3, 'failed': []}
+
+
+def test_export_does_not_replace_existing_bundle(bundle_path):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS[:1], path=bundle_path,
+                         include_data=False)
+    before = open(bundle_path, 'rb').read()
+    with pytest.raises(bundle.BundleExistsError):
+        bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS, path=bundle_path,
+                             include_data=False)
+    assert open(bundle_path, 'rb').read() == before
+    assert os.listdir(os.path.dirname(bundle_path)) == [os.path.basename(bundle_path)]
+
+
+def test_export_does_not_replace_bundle_published_meanwhile(bundle_path):
+    class PublishingSource(FakeSource):
+        def respond(self, service, method, kwargs):
+            if not os.path.exists(bundle_path):
+                open(bundle_path, 'wb').close()
+            return super().respond(service, method, kwargs)
+
+    with pytest.raises(bundle.BundleExistsError):
+        bundle.export_bundle(tm1_source=PublishingSource(), objects=OBJECTS, path=bundle_path,
+                             include_data=False)
+    assert open(bundle_path, 'rb').read() == b''
+    assert os.listdir(os.path.dirname(bundle_path)) == [os.path.basename(bundle_path)]
+
+
+def test_created_time_has_utc_offset(bundle_path):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS[:1], path=bundle_path,
+                         include_data=False)
+    created = bundle.read_bundle_header(bundle_path)['created']
+    assert datetime.datetime.fromisoformat(created).utcoffset() == datetime.timedelta(0)
+
+
+def test_unused_cellsets_fail_the_object(bundle_path, monkeypatch):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS, path=bundle_path,
+                         include_data=True)
+    monkeypatch.setattr(transfer, 'transfer_cube_consolidation_data',
+                        lambda **kwargs: None)
+    result = bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path)
+    assert result == {'imported': 2, 'failed': ['C1']}
+
+
+def test_swallowed_replay_error_fails_the_object(bundle_path):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS[1:2], path=bundle_path,
+                         include_data=True)
+    with gzip.open(bundle_path, 'rt', encoding='utf-8') as f:
+        frames = [json.loads(line) for line in f]
+    # Last cellset does not match, transfer.py catches and prints the replay error
+    last_cells = max(i for i, frame in enumerate(frames) if frame.get('frame') == 'cells')
+    frames[last_cells]['args']['skip_cell_properties'] = False
+    write_bundle(bundle_path, frames)
+
+    result = bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path)
+    assert result == {'imported': 0, 'failed': ['C1']}
+
+
+# ─── Invalid files ───
+
+def test_truncated_bundle_is_rejected(bundle_path):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS, path=bundle_path,
+                         include_data=True)
+    data = open(bundle_path, 'rb').read()
+    with open(bundle_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with pytest.raises(bundle.BundleError):
+        bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path)
+
+
+def test_corrupted_bundle_is_rejected(bundle_path):
+    bundle.export_bundle(tm1_source=FakeSource(), objects=OBJECTS, path=bundle_path,
+                         include_data=True)
+    data = bytearray(open(bundle_path, 'rb').read())
+    middle = len(data) // 2
+    data[middle:middle + 40] = bytes(b ^ 0xFF for b in data[middle:middle + 40])
+    with open(bundle_path, 'wb') as f:
+        f.write(data)
+    with pytest.raises(bundle.BundleError, match='corrupted'):
+        bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path)
+
+
+def test_missing_frames_are_rejected(bundle_path):
+    write_bundle(bundle_path, [header([{'name': 'P1', 'type': 'process'}])])
+    with pytest.raises(bundle.BundleError):
+        bundle.import_bundle(tm1_target=FakeTarget(), path=bundle_path)
+
+
+@pytest.mark.parametrize('content', [b'', b'not a bundle', gzip.compress(b'{"format": "x"}\n'),
+                                     gzip.compress(b'[1, 2]\n'),
+                                     gzip.compress(pickle.dumps({'format': 'pa12-bundle'}))])
+def test_invalid_file_is_rejected(bundle_path, content):
+    with open(bundle_path, 'wb') as f:
+        f.write(content)
+    with pytest.raises(bundle.BundleError):
+        bundle.read_bundle_header(bundle_path)
+
+
+def test_unsupported_version_is_rejected(bundle_path):
+    newer = header([])
+    newer['version'] = bundle.BUNDLE_VERSION + 1
+    write_bundle(bundle_path, [newer])
+    with pytest.raises(bundle.BundleError):
+        bundle.read_bundle_header(bundle_path)
+
+
+@pytest.mark.parametrize('class_name', ['TM1py.Services.TM1Service', 'pickle.loads',
+                                        'Dimension.from_json', 'os.system', '__class__'])
+def test_forbidden_object_class_is_rejected(bundle_path, class_name):
+    write_bundle(bundle_path, [
+        header([{'name': 'P1', 'type': 'process'}]),
+        {'frame': 'object', 'name': 'P1', 'type': 'process'},
+        {'frame': 'call', 'service': 'processes', 'method': 'get',
+         'args': {'name_process': 'P1'},
+         'object': {'class': class_name, 'cube': None, 'data': {'command': 'echo hacked'}}},
+        {'frame': 'end'},
+    ])
+    target = FakeTarget()
+    result = bundle.import_bundle(tm1_target=target, path=bundle_path)
+    assert result == {'imported': 0, 'failed': ['P1']}
+    assert target.writes == []
@@ -5,9 +5,11 @@ import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Checkbox } from '@/components/ui/checkbox';
-import { ArrowRight, Box, Layers, Cog, AlertCircle, Loader2 } from 'lucide-react';
+import { Input } from '@/components/ui/input';
+import { ArrowRight, Box, Layers, Cog, AlertCircle, Loader2, Package, Download, Upload } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
-import { listObjects, migrateObjects } from '@/services/api';
+import { listObjects, migrateObjects, listBundles, exportBundle, importBundle } from '@/services/api';
+import type { BundleInfo } from '@/services/api';
 import type { MigratableObject } from '@/types/environment';
 
 const TYPE_CONFIG = {
@@ -24,6 +26,11 @@ const MigrationPage = () => {
   const [objects, setObjects] = useState<MigratableObject[]>([]);
   const [loading, setLoading] = useState(false);
   const [migrating, setMigrating] = useState(false);
+  const [bundles, setBundles] = useState<BundleInfo[]>([]);
+  const [bundleName, setBundleName] = useState('');
+  const [includeData, setIncludeData] = useState(false);
+  const [exporting, setExporting] = useState(false);
+  const [importingBundle, setImportingBundle] = useState('');
 
   const sourceEnv = environments.find(e => e.id === sourceId);
   const targetEnv = environments.find(e => e.id === targetId);
@@ -53,6 +60,18 @@ const MigrationPage = () => {
     fetchObjects();
   }, [sourceId]);
 
+  const refreshBundles = async () => {
+    try {
+      setBundles(await listBundles());
+    } catch {
+      setBundles([]);
+    }
+  };
+
+  useEffect(() => {
+    refreshBundles();
+  }, []);
+
   const toggleObject = (name: string) => {
     setObjects(prev => prev.map(o => o.name === name ? { ...o, selected: !o.selected } : o));
   };
@@ -93,7 +112,55 @@ const MigrationPage = () => {
     }
   };
 
+  const handleExport = async () => {
+    if (!sourceEnv) return;
+    setExporting(true);
+    try {
+      const selected = objects.filter(o => o.selected);
+      const result = await exportBundle(sourceEnv, selected, includeData, bundleName.trim() || undefined);
+      toast({
+        title: result.success ? 'Export complete' : 'Export failed',
+        description: result.message,
+        variant: result.success ? 'default' : 'destructive',
+      });
+      if (result.success) {
+        setBundleName('');
+        refreshBundles();
+      }
+    } catch (err: any) {
+      toast({
+        title: 'Export failed',
+        description: err.message || 'Is Flask running?',
+        variant: 'destructive',
+      });
+    } finally {
+      setExporting(false);
+    }
+  };
+
+  const handleImport = async (name: string) => {
+    if (!targetEnv) return;
+    setImportingBundle(name);
+    try {
+      const result = await importBundle(targetEnv, name);
+      toast({
+        title: result.success ? 'Import complete' : 'Import failed',
+        description: result.message,
+        variant: result.success ? 'default' : 'destructive',
+      });
+    } catch (err: any) {
+      toast({
+        title: 'Import failed',
+        description: err.message || 'Is Flask running?',
+        variant: 'destructive',
+      });
+    } finally {
+      setImportingBundle('');
+    }
+  };
+
   const canMigrate = sourceId && targetId && sourceId !== targetId && selectedCount > 0;
+  const canExport = sourceId && selectedCount > 0;
 
   return (
     <div className="p-8 max-w-5xl mx-auto space-y-8 animate-fade-in">
@@ -218,7 +285,30 @@ const MigrationPage = () => {
             </div>
           )}
 
-          <div className="flex justify-end pt-4">
+          <div className="flex items-center justify-end gap-3 pt-4">
+            <Input
+              value={bundleName}
+              onChange={e => setBundleName(e.target.value)}
+              placeholder="Bundle name (optional)"
+              className="max-w-[220px]"
+            />
+            <label className="flex items-center gap-2 text-sm text-muted-foreground cursor-pointer">
+              <Checkbox checked={includeData} onCheckedChange={checked => setIncludeData(checked === true)} />
+              Include cube data
+            </label>
+            <Button variant="outline" onClick={handleExport} disabled={!canExport || exporting}>
+              {exporting ? (
+                <>
+                  <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                  Exporting...
+                </>
+              ) : (
+                <>
+                  <Download className="h-4 w-4 mr-2" />
+                  Export Bundle
+                </>
+              )}
+            </Button>
             <Button
               onClick={handleMigrate}
               disabled={!canMigrate || migrating}
@@ -236,6 +326,56 @@ const MigrationPage = () => {
           </div>
         </div>
       )}
+
+      {/* Stored bundles */}
+      <div className="space-y-4">
+        <div className="flex items-center justify-between">
+          <h2 className="text-lg font-semibold text-foreground">Bundles</h2>
+          <span className="text-sm text-muted-foreground">
+            {targetEnv ? `Import into ${targetEnv.name}` : 'Select a target to import'}
+          </span>
+        </div>
+        {bundles.length === 0 ? (
+          <p className="text-sm text-muted-foreground">
+            No bundles yet. Export selected objects from a source to reuse them for several targets.
+          </p>
+        ) : (
+          <Card>
+            <CardContent className="p-0 divide-y">
+              {bundles.map(b => (
+                <div key={b.name} className="flex items-center gap-4 px-6 py-3">
+                  <Package className="h-4 w-4 text-primary flex-shrink-0" />
+                  <div className="flex-1 min-w-0">
+                    <p className="text-sm font-mono" style={{ overflowWrap: 'anywhere' }}>{b.name}</p>
+                    <p className="text-xs text-muted-foreground">
+                      {new Date(b.createdAt).toLocaleString()} · {b.objects.length} object{b.objects.length !== 1 ? 's' : ''}
+                      {b.includeData ? ' · with cube data' : ''}
+                    </p>
+                  </div>
+                  <Button
+                    size="sm"
+                    variant="outline"
+                    onClick={() => handleImport(b.name)}
+                    disabled={!targetEnv || importingBundle !== ''}
+                  >
+                    {importingBundle === b.name ? (
+                      <>
+                        <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                        Importing...
+                      </>
+                    ) : (
+                      <>
+                        <Upload className="h-4 w-4 mr-2" />
+                        Import
+                      </>
+                    )}
+                  </Button>
+                </div>
+              ))}
+            </CardContent>
+          </Card>
+        )}
+      </div>
     </div>
   );
 };
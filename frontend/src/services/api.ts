@@ -42,6 +42,44 @@ export async function migrateObjects(
   });
 }
 
+// ─── Offline bundles (exported once from source, imported into any target) ───
+
+export interface BundleInfo {
+  name: string;
+  createdAt: string;
+  includeData: boolean;
+  objects: Omit<MigratableObject, 'selected'>[];
+}
+
+/** List bundles stored on the backend */
+export async function listBundles(): Promise<BundleInfo[]> {
+  return request('/bundles');
+}
+
+/** Snapshot selected objects from source environment into a bundle */
+export async function exportBundle(
+  source: PAEnvironment,
+  objects: MigratableObject[],
+  includeData: boolean,
+  name?: string
+): Promise<{ success: boolean; message: string; name?: string }> {
+  return request('/bundles/export', {
+    method: 'POST',
+    body: JSON.stringify({ source, objects, includeData, name }),
+  });
+}
+
+/** Replay a stored bundle into target environment */
+export async function importBundle(
+  target: PAEnvironment,
+  bundle: string
+): Promise<{ success: boolean; message: string }> {
+  return request('/bundles/import', {
+    method: 'POST',
+    body: JSON.stringify({ target, bundle }),
+  });
+}
+
 // ─── Environment CRUD (per-user, stored on backend as JSON) ───
 
 /** Fetch all environments for a given user */